@@ -27,36 +27,60 @@ except ImportError:
 __author__ = "Ethopy Analysis Contributors"
 
 
-# Convenient imports for common data functions
-from ethopy_analysis.data import (
-    get_sessions,
-    get_trials,
-    get_trial_states,
-    get_trial_experiment,
-    get_trial_behavior,
-    get_trial_stimulus,
-    get_trial_licks,
-    get_trial_proximities,
-    get_performance,
-    session_summary,
-)
-
-# Database and configuration functions
-from ethopy_analysis.db.schemas import (
-    get_schema,
-    get_all_schemas,
-    test_connection,
-)
-
-from ethopy_analysis.config.settings import (
-    load_config,
-    get_config_summary,
-)
-
-# Also import modules for advanced users
-from ethopy_analysis.data import loaders
-from ethopy_analysis.plots import animal
-from ethopy_analysis.db import schemas
+# Public names are resolved on first access (PEP 562) so that importing the
+# package, e.g. for the CLI configuration commands, does not load DataJoint,
+# pandas or matplotlib. Maps each name to (module, attribute); an attribute of
+# None exposes the module itself.
+_LAZY_ATTRIBUTES = {
+    # Convenient imports for common data functions
+    "get_sessions": ("ethopy_analysis.data", "get_sessions"),
+    "get_trials": ("ethopy_analysis.data", "get_trials"),
+    "get_trial_states": ("ethopy_analysis.data", "get_trial_states"),
+    "get_trial_experiment": ("ethopy_analysis.data", "get_trial_experiment"),
+    "get_trial_behavior": ("ethopy_analysis.data", "get_trial_behavior"),
+    "get_trial_stimulus": ("ethopy_analysis.data", "get_trial_stimulus"),
+    "get_trial_licks": ("ethopy_analysis.data", "get_trial_licks"),
+    "get_trial_proximities": ("ethopy_analysis.data", "get_trial_proximities"),
+    "get_performance": ("ethopy_analysis.data", "get_performance"),
+    "session_summary": ("ethopy_analysis.data", "session_summary"),
+    # Database and configuration functions
+    "get_schema": ("ethopy_analysis.db.schemas", "get_schema"),
+    "get_all_schemas": ("ethopy_analysis.db.schemas", "get_all_schemas"),
+    "test_connection": ("ethopy_analysis.db.schemas", "test_connection"),
+    "load_config": ("ethopy_analysis.config.settings", "load_config"),
+    "get_config_summary": ("ethopy_analysis.config.settings", "get_config_summary"),
+    # Also import modules for advanced users
+    "loaders": ("ethopy_analysis.data.loaders", None),
+    "animal": ("ethopy_analysis.plots.animal", None),
+    "schemas": ("ethopy_analysis.db.schemas", None),
+}
+
+# Subpackages, importable as attributes after a plain ``import ethopy_analysis``
+_LAZY_SUBPACKAGES = ("data", "plots", "db", "config")
+
+
+def __getattr__(name):
+    import importlib
+
+    if name in _LAZY_SUBPACKAGES:
+        # import_module also binds the subpackage on this package
+        return importlib.import_module(f"{__name__}.{name}")
+
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module_name, attribute = _LAZY_ATTRIBUTES[name]
+    module = importlib.import_module(module_name)
+    value = module if attribute is None else getattr(module, attribute)
+
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | set(_LAZY_SUBPACKAGES))
+
 
 __all__ = [
     # Data loading functions
@@ -3,22 +3,129 @@ Command Line Interface for Ethopy Analysis package.
 """
 
 import click
+import functools
 import sys
 import os
 from datetime import datetime
 
-from .plots.animal import (
-    plot_session_date,
-    plot_performance_liquid,
-    plot_session_performance,
-    plot_trial_per_session,
-)
-from .db.schemas import get_schema
-from .data.analysis import get_performance
-from .data.loaders import get_sessions
+# Data, database and plotting modules pull in DataJoint, pandas and matplotlib,
+# so they are imported inside the commands that need them to keep the
+# configuration commands fast.
 from .config.settings import get_config_summary, DEFAULT_CONFIG, save_config
 
 
+def cache_options(func):
+    """Add the --no-cache and --refresh-cache options to a command."""
+    func = click.option(
+        "--refresh-cache",
+        is_flag=True,
+        help="Ignore cached query results and fetch fresh data from the database",
+    )(func)
+    func = click.option(
+        "--no-cache",
+        is_flag=True,
+        help="Do not read or write the on-disk query cache",
+    )(func)
+    return func
+
+
+# Plots generated for an animal by analyze-animal and generate-report
+ANIMAL_PLOTS = (
+    "session_dates",
+    "performance_liquid",
+    "session_performance",
+    "trials_per_session",
+)
+
+
+@functools.lru_cache(maxsize=32)
+def _animal_artifacts(animal_id: int, min_trials: int):
+    """Load the sessions of an animal and their performance.
+
+    Shared by analyze-animal and generate-report and kept for the lifetime of the
+    process, so commands run back to back (e.g. from a script or CliRunner) query
+    the database once per animal. Commands clear it for --no-cache and
+    --refresh-cache. Callers must not modify the returned objects.
+
+    Returns:
+        Tuple of (sessions DataFrame with task columns, performance Series or
+        None if the animal has no sessions)
+    """
+    from .data.analysis import get_sessions_performance
+    from .data.loaders import get_sessions_with_task
+
+    sessions = get_sessions_with_task(animal_id, min_trials=min_trials)
+    if sessions.empty:
+        return sessions, None
+    return sessions, get_sessions_performance(animal_id, sessions["session"].values)
+
+
+def _draw_animal_plot(
+    plot_name: str, animal_id: int, sessions, min_trials: int, performance=None
+):
+    """Draw one of the ANIMAL_PLOTS as the current matplotlib figure.
+
+    *performance* is the optional per-session performance from
+    get_sessions_performance, shared by the plots that show it. All plots are
+    drawn from *sessions* and *performance*, so they show the same sessions
+    whether or not those came from the query cache.
+    """
+    from .data.analysis import get_performance
+    from .plots.animal import (
+        plot_session_date,
+        plot_performance_liquid,
+        plot_session_performance,
+        plot_trial_per_session,
+    )
+
+    if plot_name == "session_dates":
+        plot_session_date(animal_id, min_trials, animal_sessions=sessions)
+    elif plot_name == "performance_liquid":
+        plot_performance_liquid(animal_id, sessions, performance=performance)
+    elif plot_name == "session_performance":
+        plot_session_performance(
+            animal_id,
+            sessions["session"].values,
+            get_performance,
+            performance=performance,
+            task_names=sessions.set_index("session")["task_name"],
+        )
+    elif plot_name == "trials_per_session":
+        plot_trial_per_session(animal_id, min_trials, animal_sessions=sessions)
+    else:
+        raise ValueError(f"Unknown plot: {plot_name}")
+
+
+def _save_animal_plot(
+    plot_name: str,
+    animal_id: int,
+    sessions,
+    min_trials: int,
+    save_path: str,
+    performance=None,
+    use_cache: bool = True,
+    refresh_cache: bool = False,
+) -> str:
+    """Draw one animal plot and save it to *save_path*.
+
+    Module-level so it can run in a worker process; the cache settings are
+    passed explicitly because workers do not share the parent's state.
+    """
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    from .data.cache import configure_cache
+
+    configure_cache(enabled=use_cache, refresh=refresh_cache)
+
+    _draw_animal_plot(plot_name, animal_id, sessions, min_trials, performance)
+    plt.savefig(save_path, dpi=300, bbox_inches="tight")
+    plt.close("all")
+    return save_path
+
+
 @click.group()
 @click.version_option()
 def main():
@@ -50,16 +157,40 @@ def main():
     default=2,
     help="Minimum number of trials per session (default: 2)",
 )
-def analyze_animal(animal_id: int, save_plots: bool, output_dir: str, min_trials: int):
+@cache_options
+def analyze_animal(
+    animal_id: int,
+    save_plots: bool,
+    output_dir: str,
+    min_trials: int,
+    no_cache: bool,
+    refresh_cache: bool,
+):
     """Generate comprehensive analysis plots for an animal."""
     try:
+        if save_plots:
+            # Select the non-interactive backend before pyplot is first imported
+            import matplotlib
+
+            matplotlib.use("Agg")
+
+        import matplotlib.pyplot as plt
+
+        from .data.cache import configure_cache
+
+        configure_cache(enabled=not no_cache, refresh=refresh_cache)
+        if no_cache or refresh_cache:
+            # The in-process memo is a cache too, so both flags bypass it
+            _animal_artifacts.cache_clear()
+
         # Create output directory if saving plots
         if save_plots:
             os.makedirs(output_dir, exist_ok=True)
             click.echo(f"Saving plots to: {output_dir}")
 
         # Get sessions for the animal
-        sessions = get_sessions(animal_id, min_trials=min_trials)
+        # Performance is computed once and shared by the performance plots
+        sessions, performance = _animal_artifacts(animal_id, min_trials)
         if sessions.empty:
             click.echo(
                 f"No sessions found for animal {animal_id} with min_trials={min_trials}"
@@ -69,41 +200,29 @@ def analyze_animal(animal_id: int, save_plots: bool, output_dir: str, min_trials
         click.echo(f"Analyzing animal {animal_id} with {len(sessions)} sessions...")
 
         # Generate plots
-        plot_funcs = [
-            ("session_dates", lambda: plot_session_date(animal_id, min_trials)),
-            (
-                "performance_liquid",
-                lambda: plot_performance_liquid(animal_id, sessions),
-            ),
-            (
-                "session_performance",
-                lambda: plot_session_performance(
-                    animal_id, sessions["session"].values, get_performance
-                ),
-            ),
-            (
-                "trials_per_session",
-                lambda: plot_trial_per_session(animal_id, min_trials),
-            ),
-        ]
-
-        for plot_name, plot_func in plot_funcs:
+        for plot_name in ANIMAL_PLOTS:
             try:
                 click.echo(f"Generating {plot_name} plot...")
-                plot_func()
 
                 if save_plots:
-                    # Save using matplotlib's savefig since we need to handle the current figure
-                    import matplotlib.pyplot as plt
-
                     save_path = os.path.join(
                         output_dir, f"animal_{animal_id}_{plot_name}.png"
                     )
-                    plt.savefig(save_path, dpi=300, bbox_inches="tight")
+                    _save_animal_plot(
+                        plot_name,
+                        animal_id,
+                        sessions,
+                        min_trials,
+                        save_path,
+                        performance,
+                        use_cache=not no_cache,
+                        refresh_cache=refresh_cache,
+                    )
                     click.echo(f"  Saved: {save_path}")
                 else:
-                    import matplotlib.pyplot as plt
-
+                    _draw_animal_plot(
+                        plot_name, animal_id, sessions, min_trials, performance
+                    )
                     plt.show()
 
             except Exception as e:
@@ -129,36 +248,76 @@ def analyze_animal(animal_id: int, save_plots: bool, output_dir: str, min_trials
     default="./reports",
     help="Output directory for report (default: ./reports)",
 )
-def generate_report(animal_id: int, output_dir: str):
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Number of worker processes used to render the plots (default: 1)",
+)
+@click.option(
+    "--format",
+    "plot_format",
+    type=click.Choice(["png", "pdf"]),
+    default="png",
+    help="Save plots as separate PNG files or as one multi-page PDF (default: png)",
+)
+@cache_options
+def generate_report(
+    animal_id: int,
+    output_dir: str,
+    jobs: int,
+    plot_format: str,
+    no_cache: bool,
+    refresh_cache: bool,
+):
     """Generate a comprehensive analysis report for an animal."""
     try:
+        import numpy as np
+
+        from .data.cache import configure_cache
+
+        configure_cache(enabled=not no_cache, refresh=refresh_cache)
+        if no_cache or refresh_cache:
+            # The in-process memo is a cache too, so both flags bypass it
+            _animal_artifacts.cache_clear()
         os.makedirs(output_dir, exist_ok=True)
 
         click.echo(f"Generating comprehensive report for animal {animal_id}...")
 
-        # Get basic info
-        sessions = get_sessions(animal_id, min_trials=2)
+        # Session metadata and tasks come from a single query and the
+        # performance of all sessions from another; sessions without decisive
+        # trials are NaN so all summary statistics come from one array
+        sessions, performance = _animal_artifacts(animal_id, 2)
         if sessions.empty:
             click.echo(f"No sessions found for animal {animal_id}")
             return
 
         report_file = os.path.join(output_dir, f"animal_{animal_id}_report.txt")
 
+        perfs = performance.to_numpy(dtype=float)
+        scored = perfs[~np.isnan(perfs)]
+        stats = {
+            "count": scored.size,
+            "mean": scored.mean() if scored.size else np.nan,
+            "max": scored.max() if scored.size else np.nan,
+            "std": scored.std(ddof=1) if scored.size > 1 else np.nan,
+        }
+
         with open(report_file, "w") as f:
             f.write("ETHOPY ANALYSIS REPORT\n")
             f.write(f"Animal ID: {animal_id}\n")
-            f.write("Generated: {}\n".format(datetime.now())) 
+            f.write("Generated: {}\n".format(datetime.now()))
             f.write("=" * 50 + "\n\n")
 
             f.write("SESSION SUMMARY\n")
             f.write(f"Total sessions: {len(sessions)}\n")
-            if get_performance(animal_id, session_row['session']) is None:
+            f.write(f"Sessions with behavior: {stats['count']}\n")
+            if stats["count"] == 0:
+                f.write("Performance: no behavior in these sessions\n")
+            else:
                 f.write(
-                    f"  Performance: no behavior in this session\n"
-                )
-            else:    
-                f.write(
-                    f"  Performance: {get_performance(animal_id, session_row['session']):.3f}\n"
+                    f"Performance: mean {stats['mean']:.3f}, max {stats['max']:.3f}, "
+                    f"std {stats['std']:.3f}\n"
                 )
 
             f.write(
@@ -166,26 +325,96 @@ def generate_report(animal_id: int, output_dir: str):
             )
 
             # Add session details
-            for _, session_row in sessions.iterrows():
-                f.write(f"Session {session_row['session']}:\n")
-                f.write(f"  Trials: {session_row['trials_count']}\n")
-                f.write(
-                    f"  Performance: {get_performance(animal_id, session_row['session']):.3f}\n"
-                )
-                f.write(f"  Date: {session_row['session_tmst']}\n\n")
+            session_rows = sessions[
+                ["session", "task_name", "trials_count", "session_tmst"]
+            ].itertuples(index=False, name=None)
+            for (session, task_name, trials_count, session_tmst), perf in zip(
+                session_rows, perfs
+            ):
+                f.write(f"Session {session}:\n")
+                if isinstance(task_name, str):
+                    f.write(f"  Task: {task_name.split('/')[-1]}\n")
+                else:
+                    f.write("  Task: no task recorded\n")
+                f.write(f"  Trials: {trials_count}\n")
+                if np.isnan(perf):
+                    f.write("  Performance: no behavior in this session\n")
+                else:
+                    f.write(f"  Performance: {perf:.3f}\n")
+                f.write(f"  Date: {session_tmst}\n\n")
 
         # Generate and save all plots
         plot_dir = os.path.join(output_dir, f"animal_{animal_id}_plots")
         os.makedirs(plot_dir, exist_ok=True)
 
-        # Use the analyze_animal functionality to generate plots
-        from click.testing import CliRunner
+        if plot_format == "pdf":
+            # All pages go to one file, so the plots are drawn in this process
+            import matplotlib
+
+            matplotlib.use("Agg")
+            import matplotlib.pyplot as plt
+            from matplotlib.backends.backend_pdf import PdfPages
+
+            pdf_file = os.path.join(plot_dir, f"animal_{animal_id}_plots.pdf")
+            with PdfPages(pdf_file) as pdf:
+                for plot_name in ANIMAL_PLOTS:
+                    try:
+                        click.echo(f"Generating {plot_name} plot...")
+                        _draw_animal_plot(
+                            plot_name, animal_id, sessions, 2, performance
+                        )
+                        pdf.savefig(bbox_inches="tight")
+                    except Exception as e:
+                        click.echo(f"Error generating {plot_name}: {str(e)}", err=True)
+                    finally:
+                        plt.close("all")
+            click.echo(f"  Saved: {pdf_file}")
+
+            click.echo(f"Report generated: {report_file}")
+            click.echo(f"Plots saved to: {plot_dir}")
+            return
 
-        runner = CliRunner()
-        runner.invoke(
-            analyze_animal,
-            ["--animal-id", str(animal_id), "--save-plots", "--output-dir", plot_dir],
-        )
+        plot_jobs = [
+            (
+                plot_name,
+                animal_id,
+                sessions,
+                2,
+                os.path.join(plot_dir, f"animal_{animal_id}_{plot_name}.png"),
+                performance,
+                not no_cache,
+                refresh_cache,
+            )
+            for plot_name in ANIMAL_PLOTS
+        ]
+
+        if jobs == 1:
+            for job in plot_jobs:
+                try:
+                    click.echo(f"Generating {job[0]} plot...")
+                    click.echo(f"  Saved: {_save_animal_plot(*job)}")
+                except Exception as e:
+                    click.echo(f"Error generating {job[0]}: {str(e)}", err=True)
+        else:
+            # Each plot renders in its own interpreter; "spawn" gives every
+            # worker a fresh database connection instead of a forked socket
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            click.echo(f"Generating {len(plot_jobs)} plots with {jobs} workers...")
+            with ProcessPoolExecutor(
+                max_workers=min(jobs, len(plot_jobs)),
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as executor:
+                futures = [
+                    (job[0], executor.submit(_save_animal_plot, *job))
+                    for job in plot_jobs
+                ]
+                for plot_name, future in futures:
+                    try:
+                        click.echo(f"  Saved: {future.result()}")
+                    except Exception as e:
+                        click.echo(f"Error generating {plot_name}: {str(e)}", err=True)
 
         click.echo(f"Report generated: {report_file}")
         click.echo(f"Plots saved to: {plot_dir}")
@@ -210,10 +439,27 @@ def generate_report(animal_id: int, output_dir: str):
     required=True,
     help="Session number",
 )
-def session_summary(animal_id: int, session: int):
+@click.option(
+    "--cache",
+    "use_cache",
+    is_flag=True,
+    help="Read and write the on-disk query cache (off by default, since cached "
+    "trial states can be stale for a session that is still recording)",
+)
+@click.option(
+    "--refresh-cache",
+    is_flag=True,
+    help="Ignore cached query results and fetch fresh data from the database",
+)
+def session_summary(animal_id: int, session: int, use_cache: bool, refresh_cache: bool):
     """Print comprehensive session summary."""
     try:
         from .data.analysis import session_summary as print_session_summary
+        from .data.cache import configure_cache
+
+        # Duration and metadata are always queried live, so trial states cached
+        # while the session was recording would disagree with them for up to a day
+        configure_cache(enabled=use_cache or refresh_cache, refresh=refresh_cache)
 
         print_session_summary(animal_id, session)
     except Exception as e:
@@ -288,21 +534,39 @@ def create_config(output_path: str, template_only: bool):
         sys.exit(1)
 
 
+@main.command()
+def list_animals():
+    """List the IDs of all animals with recorded sessions."""
+    try:
+        from .data.loaders import get_animal_ids
+
+        animal_ids = get_animal_ids()
+        if len(animal_ids) == 0:
+            click.echo("No animals found")
+            return
+
+        click.echo_via_pager("\n".join(map(str, animal_ids.tolist())) + "\n")
+
+    except Exception as e:
+        click.echo(f"Error listing animals: {str(e)}", err=True)
+        sys.exit(1)
+
+
 @main.command()
 def test_db_connection():
     """Test database connection."""
     try:
+        from .db.schemas import get_all_schemas
+
         click.echo("Testing database connection...")
 
-        # Try to get schemas
-        experiment = get_schema("experiment")
-        behavior = get_schema("behavior")
-        stimulus = get_schema("stimulus")
+        # Try to get schemas, created once and shared through the schema cache
+        schemas = get_all_schemas()
 
         click.echo("Successfully connected to database")
-        click.echo(f"✓ Experiment schema: {experiment}")
-        click.echo(f"✓ Behavior schema: {behavior}")
-        click.echo(f"✓ Stimulus schema: {stimulus}")
+        click.echo(f"✓ Experiment schema: {schemas.get('experiment')}")
+        click.echo(f"✓ Behavior schema: {schemas.get('behavior')}")
+        click.echo(f"✓ Stimulus schema: {schemas.get('stimulus')}")
 
     except Exception as e:
         click.echo(f"✗ Database connection failed: {str(e)}", err=True)
@@ -10,10 +10,14 @@ import json
 import os
 import logging
 from pathlib import Path
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, Optional, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
+# Parsed config files keyed by path, stored with the file's mtime so an edited
+# file is parsed again
+_parsed_config_files: Dict[Path, Tuple[int, Dict[str, Any]]] = {}
+
 # Default configuration values
 DEFAULT_CONFIG = {
     "database": {
@@ -324,14 +328,7 @@ def load_config_with_source(config_path: Optional[Union[str, Path]] = None) -> t
 
     if config_file and config_file.exists():
         try:
-            with open(config_file, "r") as f:
-                file_config = json.load(f)
-
-            # Detect and convert ethopy local_conf.json format
-            if _is_ethopy_local_conf(file_config):
-                logger.info("Detected ethopy local_conf.json format — converting")
-                file_config = _parse_ethopy_local_conf(file_config)
-
+            file_config = _read_config_file(config_file)
             config = merge_configs(config, file_config)
             config_source = config_file
             logger.info(f"Loaded configuration from: {config_file}")
@@ -352,6 +349,32 @@ def load_config_with_source(config_path: Optional[Union[str, Path]] = None) -> t
     return config, config_source
 
 
+def _read_config_file(config_file: Path) -> Dict[str, Any]:
+    """Parse *config_file*, reusing the previous result if the file is unchanged.
+
+    Args:
+        config_file: Path to an existing JSON configuration file
+
+    Returns:
+        Configuration dictionary in ethopy_analysis format (a fresh copy)
+    """
+    mtime = config_file.stat().st_mtime_ns
+    cached = _parsed_config_files.get(config_file)
+    if cached is not None and cached[0] == mtime:
+        return copy.deepcopy(cached[1])
+
+    with open(config_file, "r") as f:
+        file_config = json.load(f)
+
+    # Detect and convert ethopy local_conf.json format
+    if _is_ethopy_local_conf(file_config):
+        logger.info("Detected ethopy local_conf.json format — converting")
+        file_config = _parse_ethopy_local_conf(file_config)
+
+    _parsed_config_files[config_file] = (mtime, file_config)
+    return copy.deepcopy(file_config)
+
+
 def get_config_summary() -> str:
     """Get a summary of the current configuration.
 
@@ -7,7 +7,9 @@ for behavioral experiments. Import the main functions you need directly from thi
 
 # Main data loading functions
 from .loaders import (
+    get_animal_ids,
     get_sessions,
+    get_sessions_with_task,
     get_trials,
     get_trial_states,
     get_trial_experiment,
@@ -16,6 +18,7 @@ from .loaders import (
     get_trial_licks,
     get_trial_proximities,
     get_session_classes,
+    clear_session_cache,
     get_session_duration,
     get_session_task,
     get_state_windows,
@@ -31,6 +34,8 @@ from .loaders import (
 # Analysis functions
 from .analysis import (
     get_performance,
+    get_sessions_performance,
+    get_sessions_liquid,
     session_summary,
     trials_per_session,
     get_port_exit_to_lick_latency,
@@ -38,6 +43,7 @@ from .analysis import (
 
 # Utility functions
 from .utils import (
+    fetch_in_chunks,
     find_combination,
     get_setup,
     check_hashable_columns,
@@ -47,11 +53,20 @@ from .utils import (
     convert_ms_to_time,
     find_consecutive_runs,
     add_column_by_key,
+    state_codes,
+)
+
+# Cache functions
+from .cache import (
+    configure_cache,
+    clear_disk_cache,
 )
 
 __all__ = [
     # Data loaders
+    "get_animal_ids",
     "get_sessions",
+    "get_sessions_with_task",
     "get_trials",
     "get_trial_states",
     "get_trial_experiment",
@@ -60,6 +75,7 @@ __all__ = [
     "get_trial_licks",
     "get_trial_proximities",
     "get_session_classes",
+    "clear_session_cache",
     "get_session_duration",
     "get_session_task",
     "get_state_windows",
@@ -72,10 +88,13 @@ __all__ = [
     "get_session_proximity_data",
     # Analysis functions
     "get_performance",
+    "get_sessions_performance",
+    "get_sessions_liquid",
     "session_summary",
     "trials_per_session",
     "get_port_exit_to_lick_latency",
     # Utility functions
+    "fetch_in_chunks",
     "find_combination",
     "get_setup",
     "check_hashable_columns",
@@ -85,4 +104,8 @@ __all__ = [
     "convert_ms_to_time",
     "find_consecutive_runs",
     "add_column_by_key",
+    "state_codes",
+    # Cache functions
+    "configure_cache",
+    "clear_disk_cache",
 ]
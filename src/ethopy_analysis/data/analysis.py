@@ -6,9 +6,12 @@ calculate performance metrics, and generate session summaries.
 """
 
 from typing import List, Optional, Union, Any
+import datajoint as dj
 import pandas as pd
 import numpy as np
 from ethopy_analysis.db.schemas import get_schema
+from ethopy_analysis.data.cache import cached_frame
+from ethopy_analysis.data.utils import state_codes
 
 
 def get_performance(
@@ -32,42 +35,120 @@ def get_performance(
     """
     from .loaders import get_trial_states
     
-    df = get_trial_states(animal_id, session)
+    df = get_trial_states(animal_id, session, columns=["trial_idx", "state"])
     if df is None or df.empty:
         print("Warning: DataFrame is empty or None - cannot calculate performance")
         return None
 
     # Filter by trials if provided
     if trials is not None:
-        df = df[df["trial_idx"].isin(trials)]
+        # Membership by binary search in the sorted trial list
+        sorted_trials = np.unique(np.asarray(trials))
+        if sorted_trials.size:
+            trial_idx = df["trial_idx"].to_numpy()
+            pos = np.searchsorted(sorted_trials, trial_idx)
+            pos = np.minimum(pos, sorted_trials.size - 1)
+            df = df[sorted_trials[pos] == trial_idx]
+        else:
+            df = df.iloc[0:0]
         if df.empty:
             print(
                 "Warning: No trials found matching the provided trial list - cannot calculate performance"
             )
             return None
 
-    # Filter to only decisive trials (Reward or Punish) - vectorized operation
-    decisive_trials = df[df["state"].isin(["Reward", "Punish"])]
+    # Count decisive trials (Reward or Punish) by comparing integer state codes
+    codes, (reward_code, punish_code) = state_codes(df["state"], ["Reward", "Punish"])
+    count_reward_trials = np.count_nonzero(codes == reward_code)
+    count_punish_trials = np.count_nonzero(codes == punish_code)
 
-    if decisive_trials.empty:
-        available_states = df["state"].unique()
+    total_decisive = count_reward_trials + count_punish_trials
+    if total_decisive == 0:
+        available_states = df["state"].unique().tolist()
         print(
             f"Warning: No Reward or Punish states found. Available states: {available_states}"
         )
         return None
 
-    # Count using vectorized operations for speed
-    state_counts = decisive_trials["state"].value_counts()
-    count_reward_trials = state_counts.get("Reward", 0)
-    count_punish_trials = state_counts.get("Punish", 0)
+    return count_reward_trials / total_decisive
 
-    # Handle division by zero edge case
-    total_decisive = count_reward_trials + count_punish_trials
-    if total_decisive == 0:
-        print("Warning: Total decisive trials is zero - cannot calculate performance")
-        return None
 
-    return count_reward_trials / total_decisive
+@cached_frame
+def get_sessions_performance(animal_id: int, sessions: List[int]) -> pd.Series:
+    """
+    Calculate the performance of many sessions with a single database query.
+
+    Equivalent to calling get_performance for every session, but the decisive
+    state onsets of all sessions are fetched together and counted client-side.
+
+    Args:
+        animal_id (int): Animal identifier
+        sessions (List[int]): Session identifiers
+
+    Returns:
+        pd.Series: Performance ratio (0-1) indexed by session, in the order of
+            *sessions*. Sessions without decisive trials are NaN.
+    """
+    from .utils import fetch_in_chunks
+
+    experiment = get_schema("experiment")
+    decisive_dj = (
+        experiment.Trial.StateOnset
+        & {"animal_id": animal_id}
+        & 'state in ("Reward", "Punish")'
+    )
+    decisive_df = fetch_in_chunks(decisive_dj, "session", sessions)
+    if decisive_df.empty:
+        return pd.Series(
+            np.nan, index=pd.Index(sessions, name="session"), name="performance"
+        )
+
+    state_counts = (
+        decisive_df.groupby(["session", "state"])
+        .size()
+        .unstack(fill_value=0)
+        .reindex(columns=["Reward", "Punish"], fill_value=0)
+    )
+    performance = state_counts["Reward"] / (
+        state_counts["Reward"] + state_counts["Punish"]
+    )
+    return performance.reindex(sessions).rename("performance")
+
+
+@cached_frame
+def get_sessions_liquid(animal_id: int, sessions: List[int]) -> pd.Series:
+    """
+    Calculate the liquid reward delivered in many sessions with a single query.
+
+    Each rewarded trial is counted once and the amounts are summed per session
+    by the database.
+
+    Args:
+        animal_id (int): Animal identifier
+        sessions (List[int]): Session identifiers
+
+    Returns:
+        pd.Series: Liquid reward (μL) indexed by session, in the order of
+            *sessions*. Sessions without rewards are 0.
+    """
+    from .utils import fetch_in_chunks
+
+    behavior = get_schema("behavior")
+    reward_trials = dj.U("session", "trial_idx").aggr(
+        behavior.Rewards & {"animal_id": animal_id},
+        reward_amount="max(reward_amount)",
+    )
+    liquid_df = fetch_in_chunks(
+        dj.U("session").aggr(reward_trials, liquid="sum(reward_amount)"),
+        "session",
+        sessions,
+    )
+    return (
+        liquid_df.set_index("session")["liquid"]
+        .astype(float)
+        .reindex(sessions, fill_value=0)
+        .rename("liquid")
+    )
 
 
 def session_summary(animal_id: int, session: int) -> None:
@@ -86,29 +167,41 @@ def session_summary(animal_id: int, session: int) -> None:
         - Task filename and git hash
         - Session performance and number of trials
     """
-    from .loaders import get_session_classes, get_session_duration, get_session_task, get_trial_states
-    
-    session_classes = get_session_classes(animal_id, session)
+    from .loaders import get_session_duration, get_trial_states
+
+    experiment = get_schema("experiment")
+    key_animal_session = {"animal_id": animal_id, "session": session}
+
+    # Session metadata and task in one row, without the task file blob
+    user_name, setup, session_tmst, task_name, git_hash = (
+        (experiment.Session * experiment.Session.Task) & key_animal_session
+    ).fetch1("user_name", "setup", "session_tmst", "task_name", "git_hash")
+    session_classes = (
+        (experiment.Trial & key_animal_session) * experiment.Condition
+    ).fetch(
+        "experiment_class", "stimulus_class", "behavior_class", as_dict=True, limit=1
+    )
+    session_classes = session_classes[0] if session_classes else {}
+
     print(f"Animal id: {animal_id}, session: {session}")
-    print(f"User name: {session_classes['user_name'].values[0]}")
-    print(f"Setup: {session_classes['setup'].values[0]}")
-    print(f"Session start: {pd.to_datetime(session_classes['session_tmst'].values[0])}")
+    print(f"User name: {user_name}")
+    print(f"Setup: {setup}")
+    print(f"Session start: {pd.to_datetime(session_tmst)}")
     print(f"Session duration: {get_session_duration(animal_id, session)}")
 
     print()
-    print("Experiment: ", session_classes["experiment_class"].values[0])
-    print("Stimulus: ", session_classes["stimulus_class"].values[0])
-    print("Behavior: ", session_classes["behavior_class"].values[0])
+    print("Experiment: ", session_classes.get("experiment_class"))
+    print("Stimulus: ", session_classes.get("stimulus_class"))
+    print("Behavior: ", session_classes.get("behavior_class"))
 
-    filename, git_hash = get_session_task(animal_id, session, save_file=False)
     print()
-    print(f"Task filename: {filename}")
+    print(f"Task filename: {task_name.split('/')[-1]}")
     print(f"Git hash: {git_hash}")
 
-    df = get_trial_states(animal_id, session)
+    df = get_trial_states(animal_id, session, columns=["trial_idx"])
     print()
     print(f"Session performance: {get_performance(animal_id, session)}")
-    print(f"Number of trials: {max(df['trial_idx'])}")
+    print(f"Number of trials: {df['trial_idx'].max()}")
 
 
 def get_port_exit_to_lick_latency(
@@ -156,7 +249,10 @@ def get_port_exit_to_lick_latency(
     return merged.reset_index(drop=True)
 
 
-def trials_per_session(animal_id: int, min_trials=2, format="df"):
+@cached_frame
+def trials_per_session(
+    animal_id: int, min_trials=2, format="df", from_date: str = "", to_date: str = ""
+):
     """Returns the number of trials per session
 
     Args:
@@ -164,17 +260,24 @@ def trials_per_session(animal_id: int, min_trials=2, format="df"):
         min_trials (int, optional): Minimum number of trials to include session. Defaults to 2.
         format (str, optional): Return format, either "df" for DataFrame or "dj" for DataJoint expression.
                                Defaults to "df".
+        from_date (str, optional): Start date in format 'YYYY-MM-DD'. Defaults to ''.
+        to_date (str, optional): End date in format 'YYYY-MM-DD'. Defaults to ''.
 
     Returns:
         Union[pd.DataFrame, Any]: DataFrame with trials_count column if format="df",
                                  DataJoint expression if format="dj"
     """
+    from .loaders import _restrict_session_dates
+
     experiment = get_schema("experiment")
 
-    session_trials_dj = (experiment.Session & {"animal_id": animal_id}).aggr(
+    animal_sessions = _restrict_session_dates(
+        experiment.Session & {"animal_id": animal_id}, from_date, to_date
+    )
+    session_trials_dj = animal_sessions.aggr(
         experiment.Trial & {"animal_id": animal_id}, trials_count="count(trial_idx)"
     ) - experiment.Session.Excluded & f"trials_count>{min_trials}"
-    
+
     if format == "dj":
         return session_trials_dj
     return session_trials_dj.fetch(format="frame").reset_index()
\ No newline at end of file
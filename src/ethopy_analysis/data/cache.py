@@ -0,0 +1,271 @@
+"""
+On-disk caching of query results for Ethopy analysis.
+
+This module provides a small result cache that stores the DataFrames returned
+by the data loaders under ``~/.cache/ethopy_analysis/``. Repeated CLI runs for
+the same animal can then skip the database round-trip entirely.
+
+DataFrames are stored as zstd-compressed Parquet files when ``pyarrow`` is
+installed (``pip install ethopy-analysis[parquet]``) and as pickle files
+otherwise, or when a frame holds values Parquet cannot represent (e.g. blobs).
+
+The cache is disabled by default for library use and is switched on by the CLI
+(see the ``--no-cache`` and ``--refresh-cache`` options).
+"""
+
+import functools
+import hashlib
+import inspect
+import logging
+import os
+import pickle
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+
+    _HAS_PYARROW = True
+except ImportError:
+    _HAS_PYARROW = False
+
+logger = logging.getLogger(__name__)
+
+# File suffixes of the supported cache entry formats, in lookup order
+_ENTRY_SUFFIXES = (".parquet", ".pkl")
+
+# Module-level cache settings, changed through configure_cache()
+_cache_settings: Dict[str, Any] = {
+    "enabled": False,
+    "refresh": False,
+    "ttl": 24 * 3600,
+    "cache_dir": Path.home() / ".cache" / "ethopy_analysis",
+}
+
+
+def configure_cache(
+    enabled: Optional[bool] = None,
+    refresh: Optional[bool] = None,
+    ttl: Optional[float] = None,
+    cache_dir: Optional[Union[str, Path]] = None,
+) -> Dict[str, Any]:
+    """
+    Configure the on-disk result cache.
+
+    Args:
+        enabled: Turn the cache on or off. Unchanged if None.
+        refresh: Ignore existing entries and overwrite them with fresh results.
+            Unchanged if None.
+        ttl: Maximum age of a cache entry in seconds. Unchanged if None.
+        cache_dir: Directory where cache entries are stored. Unchanged if None.
+
+    Returns:
+        Dictionary with the current cache settings
+
+    Example:
+        configure_cache(enabled=True, ttl=3600)
+        sessions = get_sessions(animal_id)  # fetched from the database
+        sessions = get_sessions(animal_id)  # loaded from disk
+    """
+    if enabled is not None:
+        _cache_settings["enabled"] = enabled
+    if refresh is not None:
+        _cache_settings["refresh"] = refresh
+    if ttl is not None:
+        _cache_settings["ttl"] = ttl
+    if cache_dir is not None:
+        _cache_settings["cache_dir"] = Path(cache_dir).expanduser()
+
+    logger.debug(f"Cache settings: {_cache_settings}")
+    return dict(_cache_settings)
+
+
+def clear_disk_cache() -> int:
+    """
+    Remove all entries from the on-disk result cache.
+
+    Returns:
+        Number of removed cache entries
+    """
+    cache_dir = _cache_settings["cache_dir"]
+    if not cache_dir.exists():
+        return 0
+
+    removed = 0
+    entries = [e for suffix in _ENTRY_SUFFIXES for e in cache_dir.glob(f"*{suffix}")]
+    for entry in entries:
+        try:
+            entry.unlink()
+            removed += 1
+        except OSError as e:
+            logger.warning(f"Failed to remove cache entry {entry}: {e}")
+
+    logger.info(f"Removed {removed} cache entries from {cache_dir}")
+    return removed
+
+
+def cached_frame(func: Callable) -> Callable:
+    """
+    Decorator that caches the DataFrame returned by a loader on disk.
+
+    The cache key combines the function name, its bound arguments and the
+    database host/user/schemas, so results from different databases never
+    collide. Calls that request a DataJoint expression (``format="dj"``) are
+    never cached.
+
+    Args:
+        func: Loader function returning a pandas DataFrame
+
+    Returns:
+        Wrapped function with the same signature
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _cache_settings["enabled"]:
+            return func(*args, **kwargs)
+
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        if bound.arguments.get("format") == "dj":
+            return func(*args, **kwargs)
+
+        try:
+            cache_stem = _cache_stem(func, bound.arguments)
+        except Exception as e:
+            logger.debug(f"Cannot build cache key for {func.__name__}: {e}")
+            return func(*args, **kwargs)
+
+        if not _cache_settings["refresh"]:
+            cached = _read_entry(cache_stem)
+            if cached is not None:
+                logger.debug(f"Loaded {func.__name__} result from {cache_stem}")
+                return cached
+
+        result = func(*args, **kwargs)
+        _write_entry(cache_stem, result)
+        return result
+
+    return wrapper
+
+
+# Internal API - Lower-level functions
+def _database_fingerprint() -> Tuple[Any, ...]:
+    """Identify the queried database so cache entries are not shared.
+
+    Uses the configuration pinned by db.schemas for the default schemas, so the
+    key always names the database the loaders actually query.
+    """
+    # Import here to avoid loading the configuration at module import
+    from ..db.schemas import get_default_database_config
+
+    db_config = get_default_database_config()
+    return (
+        db_config.get("host", ""),
+        db_config.get("user", ""),
+        tuple(sorted(db_config.get("schemas", {}).items())),
+    )
+
+
+def _cache_stem(func: Callable, arguments: Dict[str, Any]) -> Path:
+    """Build the cache path (without suffix) for a call of *func* with *arguments*."""
+    key = (
+        f"{func.__module__}.{func.__qualname__}",
+        _database_fingerprint(),
+        sorted(arguments.items()),
+    )
+    digest = hashlib.blake2b(pickle.dumps(key), digest_size=16).hexdigest()
+    return _cache_settings["cache_dir"] / f"{func.__name__}_{digest}"
+
+
+def _read_entry(cache_stem: Path) -> Optional[Any]:
+    """Return the cached value, or None if missing, expired or unreadable."""
+    for suffix in _ENTRY_SUFFIXES:
+        cache_file = cache_stem.with_name(cache_stem.name + suffix)
+        try:
+            age = time.time() - cache_file.stat().st_mtime
+        except OSError:
+            continue
+
+        if age > _cache_settings["ttl"]:
+            logger.debug(f"Cache entry expired: {cache_file}")
+            return None
+
+        try:
+            if suffix == ".parquet":
+                return pd.read_parquet(cache_file, engine="pyarrow")
+            with open(cache_file, "rb") as f:
+                return pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Failed to read cache entry {cache_file}: {e}")
+            return None
+
+    return None
+
+
+def _write_entry(cache_stem: Path, value: Any) -> None:
+    """Store *value* under *cache_stem*, preferring Parquet for DataFrames."""
+    try:
+        cache_stem.parent.mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        logger.warning(f"Failed to create cache directory {cache_stem.parent}: {e}")
+        return
+
+    if _HAS_PYARROW and isinstance(value, pd.DataFrame) and _parquet_safe(value):
+        written = _atomic_write(
+            cache_stem.with_name(cache_stem.name + ".parquet"),
+            lambda f: value.to_parquet(f, engine="pyarrow", compression="zstd"),
+        )
+        if written:
+            _remove_stale(cache_stem, keep=".parquet")
+            return
+
+    if _atomic_write(
+        cache_stem.with_name(cache_stem.name + ".pkl"),
+        lambda f: pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL),
+    ):
+        _remove_stale(cache_stem, keep=".pkl")
+
+
+def _parquet_safe(df: pd.DataFrame) -> bool:
+    """Return True if *df* round-trips through Parquet without changing values.
+
+    Object columns holding anything but strings (blobs, dicts, arrays) are
+    converted by pyarrow into nested types, so such frames are pickled instead.
+    """
+    return all(
+        pd.api.types.infer_dtype(df[col], skipna=True) in ("string", "empty")
+        for col in df.columns
+        if df[col].dtype == object
+    )
+
+
+def _atomic_write(cache_file: Path, write: Callable[[Any], None]) -> bool:
+    """Write *cache_file* through a temporary file and return True on success."""
+    tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_file, "wb") as f:
+            write(f)
+        os.replace(tmp_file, cache_file)
+        return True
+    except Exception as e:
+        logger.debug(f"Failed to write cache entry {cache_file}: {e}")
+        try:
+            tmp_file.unlink()
+        except OSError:
+            pass
+        return False
+
+
+def _remove_stale(cache_stem: Path, keep: str) -> None:
+    """Remove entries of *cache_stem* in formats other than *keep*."""
+    for suffix in _ENTRY_SUFFIXES:
+        if suffix != keep:
+            try:
+                cache_stem.with_name(cache_stem.name + suffix).unlink()
+            except OSError:
+                pass
@@ -6,19 +6,44 @@ and return it as pandas DataFrames or DataJoint expressions ready for analysis a
 """
 
 from typing import List, Optional, Union, Tuple, Any, Dict
+import datajoint as dj
 import pandas as pd
 import numpy as np
 import os
 from ethopy_analysis.db.schemas import get_schema
+from ethopy_analysis.data.cache import cached_frame
 from ethopy_analysis.data.utils import combine_children_tables
 
+# Session classes keyed by (animal_id, session); they are fixed once a session
+# has trials, so they are fetched once per process (see clear_session_cache,
+# which clear_schema_cache also calls)
+_cached_session_classes: Dict[Tuple[int, int], pd.DataFrame] = {}
 
+
+def get_animal_ids() -> np.ndarray:
+    """
+    Get the IDs of all animals that have recorded sessions.
+
+    The distinct IDs are computed by the database and fetched as a single
+    array, without building a DataFrame.
+
+    Returns:
+        np.ndarray: Sorted array of animal identifiers
+    """
+    experiment = get_schema("experiment")
+    return (dj.U("animal_id") & experiment.Session).fetch(
+        "animal_id", order_by="animal_id"
+    )
+
+
+@cached_frame
 def get_sessions(
     animal_id,
     from_date: str = "",
     to_date: str = "",
     format: str = "df",
     min_trials: Optional[int] = None,
+    columns: Optional[List[str]] = None,
 ):
     """
     Get sessions for an animal within a specified date range.
@@ -29,34 +54,125 @@ def get_sessions(
         to_date (str, optional): End date in format 'YYYY-MM-DD'. Defaults to ''.
         format(str, optional): if format equals 'dj' return datajoint expression.
         min_trials(int, optional): minimum number of trials per session.
+        columns(List[str], optional): attributes to fetch, primary key attributes
+            are always included. Defaults to None (all attributes).
 
     Returns:
         Union[pd.DataFrame, Any]: Session DataFrame if format="df",
                                  Session expression if format="dj"
     """
-    from .analysis import trials_per_session
-
     experiment = get_schema("experiment")
 
-    animal_session_tmt = experiment.Session & {"animal_id": animal_id}
-    if from_date != "":
-        animal_session_tmt = animal_session_tmt & f'session_tmst > "{from_date}"'
-
-    if to_date != "":
-        animal_session_tmt = animal_session_tmt & f'session_tmst < "{to_date}"'
+    animal_session_tmt = _restrict_session_dates(
+        experiment.Session & {"animal_id": animal_id}, from_date, to_date
+    )
 
     sessions_dj = animal_session_tmt - experiment.Session.Excluded
     if min_trials:
-        trials_session = trials_per_session(animal_id, min_trials=2, format="dj")
-        sessions_dj = trials_session * sessions_dj
+        # One GROUP BY ... HAVING query that keeps all session attributes
+        sessions_dj = sessions_dj.aggr(
+            experiment.Trial & {"animal_id": animal_id},
+            ...,
+            trials_count="count(trial_idx)",
+        ) & f"trials_count>{min_trials}"
+    sessions_dj = _select_columns(sessions_dj, columns)
 
     if format == "dj":
         return sessions_dj
-    return sessions_dj.fetch(format="frame").reset_index()
+    return _normalize_session_tmst(sessions_dj.fetch(format="frame").reset_index())
+
+
+@cached_frame
+def get_sessions_with_task(
+    animal_id,
+    from_date: str = "",
+    to_date: str = "",
+    format: str = "df",
+    min_trials: Optional[int] = None,
+):
+    """
+    Get sessions for an animal together with the task each session ran.
+
+    Left-joins the sessions returned by get_sessions with Session.Task so
+    session metadata, trial counts and task names come back in a single query.
+    Sessions without a Session.Task entry are kept with an empty task_name.
+
+    Args:
+        animal_id (int): The animal identifier
+        from_date (str, optional): Start date in format 'YYYY-MM-DD'. Defaults to ''.
+        to_date (str, optional): End date in format 'YYYY-MM-DD'. Defaults to ''.
+        format(str, optional): if format equals 'dj' return datajoint expression.
+        min_trials(int, optional): minimum number of trials per session.
+
+    Returns:
+        Union[pd.DataFrame, Any]: Session DataFrame with additional task_name and
+                                 git_hash columns if format="df",
+                                 DataJoint expression if format="dj"
+    """
+    experiment = get_schema("experiment")
+
+    sessions_dj = get_sessions(
+        animal_id, from_date, to_date, format="dj", min_trials=min_trials
+    )
+    # Leave the task_file blob on the server, only its name is needed here
+    sessions_task_dj = sessions_dj.join(
+        experiment.Session.Task.proj("task_name", "git_hash"), left=True
+    )
+
+    if format == "dj":
+        return sessions_task_dj
+    return _normalize_session_tmst(
+        sessions_task_dj.fetch(format="frame").reset_index()
+    )
+
+
+def _restrict_session_dates(sessions_dj: Any, from_date: str, to_date: str) -> Any:
+    """Restrict a session expression to session_tmst between the given dates.
+
+    Empty dates leave the corresponding bound open.
+    """
+    if from_date != "":
+        sessions_dj = sessions_dj & f'session_tmst > "{from_date}"'
+    if to_date != "":
+        sessions_dj = sessions_dj & f'session_tmst < "{to_date}"'
+    return sessions_dj
+
+
+def _normalize_session_tmst(sessions_df: pd.DataFrame) -> pd.DataFrame:
+    """Store session_tmst as timezone-naive datetime64 for fast downstream use.
+
+    Plotting and date arithmetic then stay on NumPy datetime64 instead of
+    converting Python datetime objects element by element.
+    """
+    if "session_tmst" in sessions_df.columns:
+        session_tmst = pd.to_datetime(sessions_df["session_tmst"])
+        if session_tmst.dt.tz is not None:
+            session_tmst = session_tmst.dt.tz_localize(None)
+        sessions_df["session_tmst"] = session_tmst
+    return sessions_df
+
+
+def _select_columns(query: Any, columns: Optional[List[str]]) -> Any:
+    """Project *query* on *columns*, primary key attributes are always kept.
+
+    Args:
+        query: DataJoint expression
+        columns: Secondary attributes to keep, or None to keep all attributes
+
+    Returns:
+        The projected DataJoint expression, or *query* if columns is None
+    """
+    if columns is None:
+        return query
+    return query.proj(*[c for c in columns if c not in query.primary_key])
 
 
 def get_trials(
-    animal_id: int, session: int, format: str = "df", remove_abort: bool = False
+    animal_id: int,
+    session: int,
+    format: str = "df",
+    remove_abort: bool = False,
+    columns: Optional[List[str]] = None,
 ) -> Union[pd.DataFrame, Any]:
     """
     Retrieve trial data for a specific animal session.
@@ -67,6 +183,8 @@ def get_trials(
         format (str, optional): Return format, either "df" for DataFrame or "dj" for DataJoint expression.
                                Defaults to "df".
         remove_abort (bool): remove abort trials
+        columns (Optional[List[str]], optional): Attributes to fetch. Primary key
+                               attributes are always included. Defaults to None (all attributes).
 
     Returns:
         Union[pd.DataFrame, Any]: Trial DataFrame if format="df",
@@ -76,13 +194,18 @@ def get_trials(
     trials_dj = experiment.Trial & {"animal_id": animal_id, "session": session}
     if remove_abort:
         trials_dj = trials_dj - experiment.Trial.Aborted()
+    trials_dj = _select_columns(trials_dj, columns)
     if format == "dj":
         return trials_dj
     return trials_dj.fetch(format="frame").reset_index()
 
 
+@cached_frame
 def get_trial_states(
-    animal_id: int, session: int, format: str = "df"
+    animal_id: int,
+    session: int,
+    format: str = "df",
+    columns: Optional[List[str]] = None,
 ) -> Union[pd.DataFrame, Any]:
     """
     Retrieve trial state onset data for a specific animal session.
@@ -92,20 +215,37 @@ def get_trial_states(
         session (int): The session number
         format (str, optional): Return format, either "df" for DataFrame or "dj" for DataJoint expression.
                                Defaults to "df".
+        columns (Optional[List[str]], optional): Attributes to fetch. Primary key
+                               attributes are always included. Defaults to None (all attributes).
 
     Returns:
         Union[pd.DataFrame, Any]: Trial states DataFrame if format="df",
-                                 DataJoint expression if format="dj"
+                                 DataJoint expression if format="dj".
+                                 The state column is categorical.
+
+    Note:
+        Since the state column has the ``category`` dtype, a filtered frame keeps
+        all categories: ``value_counts()`` lists absent states with a count of 0
+        and ``groupby("state")`` should pass ``observed=True``. Call
+        ``df["state"].cat.remove_unused_categories()`` after filtering, or
+        ``df["state"].astype(str)`` for the previous object dtype.
     """
     experiment = get_schema("experiment")
     key_animal_session = {"animal_id": animal_id, "session": session}
 
-    trial_states_dj = experiment.Trial.StateOnset & key_animal_session
+    trial_states_dj = _select_columns(
+        experiment.Trial.StateOnset & key_animal_session, columns
+    )
 
     if format == "dj":
         return trial_states_dj
 
     trial_states_df = trial_states_dj.fetch(format="frame").reset_index()
+    # Few distinct states, so comparisons and groupbys work on integer codes
+    if "state" in trial_states_df.columns:
+        trial_states_df["state"] = (
+            trial_states_df["state"].astype("category").cat.remove_unused_categories()
+        )
     return trial_states_df
 
 
@@ -238,24 +378,36 @@ def get_trial_stimulus(
 
     children = stim_conds.children(as_objects=True)
     base_dj = (stimulus.StimCondition.Trial & key_animal_session) * stim_conds
-    all_stims = base_dj
 
-    for child in children:
-        comb_stims = base_dj * child
-        if len(comb_stims) > 0:
-            all_stims = all_stims * child
-
-    trial_stim_conditions_dj = all_stims
     if format == "dj":
-        return trial_stim_conditions_dj
-    trial_stim_conditions_df = trial_stim_conditions_dj.fetch(
-        format="frame"
-    ).reset_index()
+        all_stims = base_dj
+        for child in children:
+            comb_stims = base_dj * child
+            if len(comb_stims) > 0:
+                all_stims = all_stims * child
+        return all_stims
+
+    # Fetch each child restricted to the session's conditions and join
+    # client-side, so no count query is needed to skip empty children
+    trial_stim_conditions_df = base_dj.fetch(format="frame").reset_index()
+    for child in children:
+        child_df = (child & base_dj).fetch(format="frame").reset_index()
+        if child_df.empty:
+            continue
+        join_columns = [
+            col for col in child_df.columns if col in trial_stim_conditions_df.columns
+        ]
+        trial_stim_conditions_df = trial_stim_conditions_df.merge(
+            child_df, on=join_columns, how="inner"
+        )
     return trial_stim_conditions_df
 
 
 def get_trial_licks(
-    animal_id: int, session: int, format: str = "df"
+    animal_id: int,
+    session: int,
+    format: str = "df",
+    columns: Optional[List[str]] = None,
 ) -> Union[pd.DataFrame, Any]:
     """
     Retrieve all licks of a session.
@@ -265,6 +417,8 @@ def get_trial_licks(
         session (int): The session number
         format (str, optional): Return format, either "df" for DataFrame or "dj" for DataJoint expression.
                                Defaults to "df".
+        columns (Optional[List[str]], optional): Attributes to fetch. Primary key
+                               attributes are always included. Defaults to None (all attributes).
 
     Returns:
         Union[pd.DataFrame, Any]: Trial behavior conditions DataFrame if format="df",
@@ -272,14 +426,18 @@ def get_trial_licks(
     """
     behavior = get_schema("behavior")
     key = {"animal_id": animal_id, "session": session}
-    lick_dj = behavior.Activity.Lick & key
+    lick_dj = _select_columns(behavior.Activity.Lick & key, columns)
     if format == "dj":
         return lick_dj
     return lick_dj.fetch(format="frame").reset_index()
 
 
 def get_trial_proximities(
-    animal_id, session, ports: Optional[List] = None, format="df"
+    animal_id,
+    session,
+    ports: Optional[List] = None,
+    format="df",
+    columns: Optional[List[str]] = None,
 ):
     """
     Retrieve proximity sensor data for a specific animal session.
@@ -290,6 +448,8 @@ def get_trial_proximities(
         ports (Optional[List]): List of port numbers to filter by
         format (str, optional): Return format, either "df" for DataFrame or "dj" for DataJoint expression.
                                Defaults to "df".
+        columns (Optional[List[str]], optional): Attributes to fetch. Primary key
+                               attributes are always included. Defaults to None (all attributes).
 
     Returns:
         Union[pd.DataFrame, Any]: Proximity data DataFrame if format="df",
@@ -307,6 +467,7 @@ def get_trial_proximities(
             "animal_id": animal_id,
             "session": session,
         }
+    proximity_dj = _select_columns(proximity_dj, columns)
     if format == "dj":
         return proximity_dj
     return proximity_dj.fetch(format="frame").reset_index()
@@ -326,7 +487,16 @@ def get_session_classes(animal_id: int, session: int) -> pd.DataFrame:
 
     Raises:
         Exception: If no session found for the given animal_id and session
+
+    Note:
+        Results are cached per (animal_id, session) for the lifetime of the
+        process; call clear_session_cache() to fetch them again. The cache is
+        also cleared by clear_schema_cache(), e.g. when switching databases.
     """
+    cache_key = (int(animal_id), int(session))
+    if cache_key in _cached_session_classes:
+        return _cached_session_classes[cache_key].copy()
+
     experiment = get_schema("experiment")
     key_animal_session = {"animal_id": animal_id, "session": session}
     session_info_df = (
@@ -334,20 +504,42 @@ def get_session_classes(animal_id: int, session: int) -> pd.DataFrame:
     )
 
     conditions_dj = (experiment.Trial & key_animal_session) * experiment.Condition
-    conditions_df = conditions_dj.fetch(format="frame").reset_index()
-
-    # Get unique combinations
-    unique_combinations = conditions_df[
-        ["stimulus_class", "behavior_class", "experiment_class"]
-    ].drop_duplicates()
 
-    # Combine session_info_df and unique_combinations side by side
-    combined_df = pd.concat(
-        [session_info_df, unique_combinations.reset_index(drop=True)], axis=1
+    # Get unique combinations, computed by the database (SELECT DISTINCT)
+    class_columns = ["stimulus_class", "behavior_class", "experiment_class"]
+    unique_combinations = (
+        (dj.U(*class_columns) & conditions_dj)
+        .fetch(format="frame")
+        .reset_index()[class_columns]
     )
+
+    # Repeat the single session row for every class combination
+    if unique_combinations.empty:
+        combined_df = session_info_df.reindex(
+            columns=[*session_info_df.columns, *class_columns]
+        )
+    else:
+        combined_df = unique_combinations.assign(
+            **{col: session_info_df[col].iat[0] for col in session_info_df.columns}
+        )[[*session_info_df.columns, *class_columns]]
+
+    # Sessions without trials yet may still change, so they are not cached
+    if not unique_combinations.empty:
+        _cached_session_classes[cache_key] = combined_df.copy()
     return combined_df
 
 
+def clear_session_cache():
+    """
+    Clear the cached session classes returned by get_session_classes.
+
+    Example:
+        clear_session_cache()
+        session_classes = get_session_classes(animal_id, session)  # fetched again
+    """
+    _cached_session_classes.clear()
+
+
 def get_session_duration(animal_id: int, session: int) -> Optional[str]:
     """
     Calculate the duration of a session based on the last state onset time.
@@ -363,12 +555,13 @@ def get_session_duration(animal_id: int, session: int) -> Optional[str]:
     from .utils import convert_ms_to_time
 
     experiment = get_schema("experiment")
+    # Only the last state onset is transferred
     state_times = (
         experiment.Trial.StateOnset & {"animal_id": animal_id, "session": session}
-    ).fetch("time")
+    ).fetch("time", order_by="time DESC", limit=1)
     if len(state_times) < 1:
         return None
-    return convert_ms_to_time(state_times[-1])["formatted"]
+    return convert_ms_to_time(state_times[0])["formatted"]
 
 
 def get_session_task(
@@ -28,6 +28,67 @@ def combine_children_tables(children: List[Any]) -> Any:
     """
     return reduce(lambda x, y: x * y, children)
 
+
+def fetch_in_chunks(
+    query: Any,
+    attribute: str,
+    values: List[Any],
+    chunk_size: int = 500,
+) -> pd.DataFrame:
+    """
+    Fetch a DataJoint expression restricted to many attribute values in chunks.
+
+    Restricting by a long list of values produces one huge ``IN``/``OR`` clause
+    and a single large result set. Splitting the values into chunks keeps each
+    query and its intermediate frame bounded.
+
+    Args:
+        query (Any): DataJoint expression to fetch from
+        attribute (str): Name of the attribute to restrict on (e.g. "session")
+        values (List[Any]): Values of *attribute* to fetch
+        chunk_size (int, optional): Maximum number of values per query. Defaults to 500.
+
+    Returns:
+        pd.DataFrame: Concatenated fetch results with a default integer index
+
+    Example:
+        >>> tasks = experiment.Session.Task & {"animal_id": animal_id}
+        >>> tasks_df = fetch_in_chunks(tasks.proj("task_name"), "session", sessions)
+    """
+    # Plain Python scalars keep the generated SQL literals clean
+    values = [v.item() if isinstance(v, np.generic) else v for v in values]
+    if not values:
+        return (query & []).fetch(format="frame").reset_index()
+
+    frames = [
+        (query & [{attribute: value} for value in values[i : i + chunk_size]])
+        .fetch(format="frame")
+        .reset_index()
+        for i in range(0, len(values), chunk_size)
+    ]
+    if len(frames) == 1:
+        return frames[0]
+    return pd.concat(frames, ignore_index=True)
+
+
+def state_codes(states: pd.Series, names: List[str]) -> Tuple[np.ndarray, List[int]]:
+    """Return integer codes of *states* and the code of each of *names*.
+
+    Categorical columns (as returned by get_trial_states) reuse their codes,
+    other columns are factorized once. Names that do not occur get a code that
+    matches no row.
+    """
+    if isinstance(states.dtype, pd.CategoricalDtype):
+        codes, categories = states.cat.codes.to_numpy(), states.cat.categories
+    else:
+        codes, categories = pd.factorize(states)
+        categories = pd.Index(categories)
+    name_codes = [
+        categories.get_loc(name) if name in categories else -2 for name in names
+    ]
+    return codes, name_codes
+
+
 def find_combination(states_df: pd.DataFrame, state: str = "PreTrial") -> str:
     """
     Find the next state after the specified state in a trial sequence.
@@ -45,15 +106,19 @@ def find_combination(states_df: pd.DataFrame, state: str = "PreTrial") -> str:
     Raises:
         IndexError: If the specified state is the last state in the sequence
     """
-    trial_states = states_df["state"].values
-    if state not in trial_states:
+    codes, (state_code, offtime_code) = state_codes(
+        states_df["state"], [state, "Offtime"]
+    )
+    is_state = codes == state_code
+    if not is_state.any():
         return "None"
-    if "Offtime" in trial_states:
+    if (codes == offtime_code).any():
         return "None"
-    idx = np.where(trial_states == state)[0][0]
-    if idx + 1 >= len(trial_states):
+    # argmax of the mask is the first occurrence of the state
+    idx = int(is_state.argmax())
+    if idx + 1 >= codes.size:
         return "None"
-    return trial_states[idx + 1]
+    return states_df["state"].iat[idx + 1]
 
 
 def get_setup(setup: str) -> Tuple[int, int]:
@@ -70,10 +135,10 @@ def get_setup(setup: str) -> Tuple[int, int]:
         IndexError: If no setup found with the given identifier
     """
     experiment = get_schema("experiment")
-    setup_data = (
-        (experiment.Control & f'setup="{setup}"').fetch(format="frame").reset_index()
+    animal_ids, sessions = (experiment.Control & f'setup="{setup}"').fetch(
+        "animal_id", "session", limit=1
     )
-    return int(setup_data["animal_id"].values[0]), int(setup_data["session"].values[0])
+    return int(animal_ids[0]), int(sessions[0])
 
 
 def check_hashable_columns(df: pd.DataFrame) -> Tuple[List[str], List[str]]:
@@ -264,7 +329,16 @@ def add_column_by_key(
     df_indexed = df_source.set_index(key_col)
     for col in value_cols:
         mapped = df_main[key_col].map(df_indexed[col])
+        if isinstance(mapped.dtype, pd.CategoricalDtype):
+            # Keep only the categories that were mapped, e.g. from filtered states
+            mapped = mapped.cat.remove_unused_categories()
         if fill_value is not None:
+            # Categorical columns (e.g. trial states) only accept known categories
+            if (
+                isinstance(mapped.dtype, pd.CategoricalDtype)
+                and fill_value not in mapped.cat.categories
+            ):
+                mapped = mapped.cat.add_categories([fill_value])
             mapped = mapped.fillna(fill_value)
         df_main[col] = mapped
 
@@ -16,6 +16,12 @@ logger = logging.getLogger(__name__)
 # Simple cache using connection string as key
 _cached_schemas: Dict[str, Dict[str, Any]] = {}
 
+# Database configuration and schemas used when no config is passed. Both are
+# pinned on first use, so calls without an explicit config skip loading the
+# configuration and always refer to the same database (see clear_schema_cache)
+_default_config: Dict[str, Any] = {}
+_default_schemas: Dict[str, Any] = {}
+
 
 # Public API - Main user interface
 
@@ -59,6 +65,8 @@ def get_all_schemas(config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     Get all three schemas (experiment, behavior, stimulus) at once.
 
     This is the main function that handles caching and schema creation.
+    The default configuration and its schemas are resolved once per process;
+    call clear_schema_cache() after changing the configuration.
 
     Args:
         config: Optional database configuration. If None, uses default config.
@@ -77,10 +85,12 @@ def get_all_schemas(config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     # Get configuration (pass explicitly instead of loading internally)
     if config is None:
-        # Import here to avoid circular imports
-        from ..config.settings import get_database_config
+        if _default_schemas:
+            return _default_schemas
 
-        config = get_database_config()
+        schemas = get_all_schemas(get_default_database_config())
+        _default_schemas.update(schemas)
+        return schemas
 
     # Create simple cache key from configuration
     cache_key = _create_cache_key(config)
@@ -108,12 +118,31 @@ def get_all_schemas(config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         raise ConnectionError(f"Failed to create DataJoint schemas: {e}")
 
 
+def get_default_database_config() -> Dict[str, Any]:
+    """
+    Get the database configuration used when no config is passed.
+
+    The configuration is loaded once per process and stays pinned together with
+    the default schemas until clear_schema_cache() is called.
+
+    Returns:
+        Database configuration dictionary (a shallow copy)
+    """
+    if not _default_config:
+        # Import here to avoid circular imports
+        from ..config.settings import get_database_config
+
+        _default_config.update(get_database_config())
+    return dict(_default_config)
+
+
 def clear_schema_cache():
     """
     Clear all cached schemas.
 
     Useful for testing, configuration changes, or when you want to force
-    recreation of schemas.
+    recreation of schemas. Session classes cached by get_session_classes are
+    cleared as well, since they belong to the previous database.
 
     Example:
         clear_schema_cache()
@@ -121,6 +150,12 @@ def clear_schema_cache():
     """
     global _cached_schemas
     _cached_schemas.clear()
+    _default_config.clear()
+    _default_schemas.clear()
+    # Imported here because the data loaders import this module
+    from ..data.loaders import clear_session_cache
+
+    clear_session_cache()
     logger.info("Schema cache cleared")
 
 
@@ -173,14 +208,9 @@ def test_connection(config: Optional[Dict[str, Any]] = None) -> bool:
             print("Database connection failed!")
     """
     try:
-        if config is None:
-            # Import here to avoid circular imports
-            from ..config.settings import get_database_config
-
-            config = get_database_config()
-
-        # Test connection by creating schemas (without caching)
-        _setup_database_connection(config=config)
+        # Reuse cached schemas so repeated tests skip the schema reflection,
+        # the ping below still checks the live connection
+        get_all_schemas(config)
 
         # Try a simple query to test the connection
         dj.conn().ping()
@@ -1,4 +1,3 @@
-from collections import defaultdict
 from datetime import date
 from typing import Dict, List, Optional
 
@@ -8,13 +7,21 @@ import numpy as np
 import pandas as pd
 
 from ethopy_analysis.data.loaders import get_sessions
-from ethopy_analysis.data.analysis import get_performance, trials_per_session
+from ethopy_analysis.data.analysis import (
+    get_sessions_liquid,
+    get_sessions_performance,
+    trials_per_session,
+)
+from ethopy_analysis.data.utils import fetch_in_chunks
 from ethopy_analysis.db.schemas import get_schema
 from ethopy_analysis.plots.utils import save_plot
 
 
 def plot_session_date(
-    animal_id: int, min_trials: int = 0, save_path: Optional[str] = None
+    animal_id: int,
+    min_trials: int = 0,
+    save_path: Optional[str] = None,
+    animal_sessions: Optional[pd.DataFrame] = None,
 ) -> Dict[date, List[int]]:
     """Plot sessions per date to visualize training schedule.
 
@@ -26,30 +33,32 @@ def plot_session_date(
         min_trials: Minimum number of trials required per session to include in analysis.
             Sessions with fewer trials will be excluded. Defaults to 0.
         save_path: Path to save the plot image. If None, plot is not saved.
+        animal_sessions: Sessions with 'session' and 'session_tmst' columns, e.g.
+            from get_sessions. If None, they are fetched with min_trials.
 
     Returns:
         Dictionary mapping each date to a list of session IDs conducted on that date.
 
     """
-    experiment = get_schema("experiment")
-    animal_sessions_tc = get_sessions(
-        animal_id, min_trials=min_trials, format="dj"
-    ).proj(setup_="setup")
-    tmst, session = (
-        animal_sessions_tc
-        * (experiment.Session & {"animal_id": animal_id} & "session>0")
-    ).fetch("session_tmst", "session")
-    session_same_date = defaultdict(list)
-    # tmst[0].date()
-    for i, _ in enumerate(tmst):
-        if tmst[i].date() not in session_same_date:
-            session_same_date[tmst[i].date()] = [session[i]]
-        else:
-            session_same_date[tmst[i].date()].append(session[i])
-    dates_sess, sess_c = [], []
-    for date_sess in session_same_date:
-        dates_sess.append(date_sess)
-        sess_c.append(len(session_same_date[date_sess]))
+    if animal_sessions is None:
+        animal_sessions_tc = get_sessions(
+            animal_id, min_trials=min_trials, format="dj", columns=["session_tmst"]
+        )
+        tmst, session = (animal_sessions_tc & "session>0").fetch(
+            "session_tmst", "session"
+        )
+    else:
+        animal_sessions = animal_sessions[animal_sessions["session"] > 0]
+        tmst = animal_sessions["session_tmst"].to_numpy()
+        session = animal_sessions["session"].to_numpy()
+    # group the sessions by calendar day, in order of first appearance
+    session_days = pd.to_datetime(tmst).normalize()
+    session_same_date = {
+        day.date(): day_sessions.tolist()
+        for day, day_sessions in pd.Series(session).groupby(session_days, sort=False)
+    }
+    dates_sess = list(session_same_date)
+    sess_c = [len(day_sessions) for day_sessions in session_same_date.values()]
 
     plt.figure(figsize=(20, 7))
     plt.bar(dates_sess, sess_c)
@@ -70,6 +79,7 @@ def plot_performance_liquid(
     animal_sessions: pd.DataFrame,
     xaxis: str = "session",
     save_path: Optional[str] = None,
+    performance: Optional[pd.Series] = None,
 ) -> None:
     """Plot performance vs liquid reward consumption over sessions.
 
@@ -85,22 +95,19 @@ def plot_performance_liquid(
         xaxis: X-axis format, either 'session' for session IDs or 'date' for timestamps.
             Defaults to 'session'.
         save_path: Path to save the plot image. If None, plot is not saved.
+        performance: Precomputed performance indexed by session, e.g. from
+            get_sessions_performance. If None, it is calculated for all sessions
+            with one query.
 
     """
-    behavior = get_schema("behavior")
     sessions = animal_sessions["session"].values
     if len(sessions) == 0:
         print("No session available")
-    perfs = [get_performance(animal_id, sess) for sess in sessions]
-    liquid = []
-    for sess in sessions:
-        reward_animal = behavior.Rewards & {"animal_id": animal_id, "session": sess}
-        reward_animal_df = reward_animal.fetch(format="frame").reset_index()
-        liquid.append(
-            np.sum(
-                reward_animal_df.drop_duplicates(subset=["trial_idx"])["reward_amount"]
-            )
-        )
+    if performance is None:
+        performance = get_sessions_performance(animal_id, sessions)
+    perfs = performance.reindex(sessions).tolist()
+
+    liquid = get_sessions_liquid(animal_id, sessions).tolist()
 
     assert len(liquid) == len(perfs)
 
@@ -157,18 +164,14 @@ def find_uniq_pos(arr: List) -> tuple[List, List[int]]:
         - List of starting positions for each unique value
 
     """
-    uniq_starts = []
-    uniq_value = []
-    for i in range(len(arr)):
-        if len(uniq_value) == 0:
-            uniq_value.append(arr[i])
-            uniq_starts.append(i)
-        else:
-            if arr[i] != arr[uniq_starts[-1]]:
-                uniq_value.append(arr[i])
-                uniq_starts.append(i)
+    values = np.asarray(arr)
+    if values.size == 0:
+        return [], []
 
-    return uniq_value, uniq_starts
+    # a run starts at the first element and wherever the value changes
+    uniq_starts = np.concatenate(([0], np.flatnonzero(values[1:] != values[:-1]) + 1))
+
+    return values[uniq_starts].tolist(), uniq_starts.tolist()
 
 
 def plot_session_performance(
@@ -176,6 +179,8 @@ def plot_session_performance(
     sessions: List[int],
     perf_func: callable,
     save_path: Optional[str] = None,
+    performance: Optional[pd.Series] = None,
+    task_names: Optional[pd.Series] = None,
 ) -> List[float]:
     """Plot session performance over time with protocol visualization.
 
@@ -189,24 +194,39 @@ def plot_session_performance(
         perf_func: Function that calculates performance for a given animal_id and session.
             Should have signature: perf_func(animal_id: int, session: int) -> float
         save_path: Path to save the plot image. If None, plot is not saved.
+        performance: Precomputed performance indexed by session, e.g. from
+            get_sessions_performance. If given, perf_func is not called.
+        task_names: Task name indexed by session, e.g. the task_name column of
+            get_sessions_with_task. If None, the tasks are fetched from
+            Session.Task.
 
     Returns:
         List of performance values for each session, in the same order as input sessions.
 
     """
-    experiment = get_schema("experiment")
     protocols, color_layer = [], [0]
-    task_session_dj = (
-        experiment.Session.Task()
-        & [f"session={session}" for session in sessions]
-        & f"animal_id={animal_id}"
-    )
-    prtcls = task_session_dj.fetch("task_name")
-    prtcls = [prtcl.split("/")[-1] for prtcl in prtcls]
-    sessions = task_session_dj.fetch("session")
+    if task_names is None:
+        # session and task name come from the same fetch
+        experiment = get_schema("experiment")
+        task_session_df = fetch_in_chunks(
+            (experiment.Session.Task() & {"animal_id": animal_id}).proj("task_name"),
+            "session",
+            sessions,
+        )
+    else:
+        # sessions without a task are left out, as with the Session.Task fetch
+        task_names = task_names.rename("task_name").rename_axis("session").dropna()
+        task_session_df = task_names[task_names.index.isin(sessions)].reset_index()
+    # chunks are concatenated in arbitrary order, so sort once here
+    task_session_df = task_session_df.sort_values("session", ignore_index=True)
+    prtcls = [prtcl.split("/")[-1] for prtcl in task_session_df["task_name"]]
+    sessions = task_session_df["session"].values
     if len(sessions) == 0:
         print("No session available")
-    perfs = [perf_func(animal_id, sess) for sess in sessions]
+    if performance is not None:
+        perfs = performance.reindex(sessions).tolist()
+    else:
+        perfs = [perf_func(animal_id, sess) for sess in sessions]
 
     protocols, color_layer = find_uniq_pos(prtcls)
     color_layer.append(sessions[-1])
@@ -235,7 +255,10 @@ def plot_session_performance(
 
 
 def plot_trial_per_session(
-    animal_id: int, min_trials: int = 2, save_path: Optional[str] = None
+    animal_id: int,
+    min_trials: int = 2,
+    save_path: Optional[str] = None,
+    animal_sessions: Optional[pd.DataFrame] = None,
 ) -> None:
     """Plot the distribution of trials per session.
 
@@ -248,9 +271,15 @@ def plot_trial_per_session(
         min_trials: Minimum number of trials required per session to include in analysis.
             Sessions with fewer trials will be excluded. Defaults to 2.
         save_path: Path to save the plot image. If None, plot is not saved.
+        animal_sessions: Sessions with 'animal_id', 'session' and 'trials_count'
+            columns, e.g. from get_sessions_with_task with min_trials. If None,
+            they are fetched with trials_per_session.
 
     """
-    animal_sessions_tc = trials_per_session(animal_id, min_trials)
+    if animal_sessions is None:
+        animal_sessions_tc = trials_per_session(animal_id, min_trials)
+    else:
+        animal_sessions_tc = animal_sessions
     animal_id = animal_sessions_tc["animal_id"].iloc[0]
     plt.figure(figsize=(15, 5))
     sess = animal_sessions_tc["session"].values
@@ -1,4 +1,3 @@
-import bisect
 import itertools
 import logging
 from datetime import timedelta
@@ -7,6 +6,7 @@ from typing import List, Optional, Tuple, Dict, Any
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
+from matplotlib.collections import PolyCollection
 from matplotlib.lines import Line2D
 
 from ethopy_analysis.data.loaders import (
@@ -999,37 +999,35 @@ def liquidsPlot(animal_id: int, days: int = 15, save_path=None) -> None:
     experiment = get_schema("experiment")
     behavior = get_schema("behavior")
     reward_animal = behavior.Rewards & {"animal_id": animal_id}
-    liquids = (reward_animal * experiment.Session()).fetch(
-        "session_tmst", "reward_amount"
+
+    # date of the last rewarded session, so only the last days are fetched
+    last_tmst = (experiment.Session & reward_animal).fetch(
+        "session_tmst", order_by="session_tmst DESC", limit=1
     )
+    if len(last_tmst) == 0:
+        print(f"No rewards found for animal {animal_id}")
+        return
+    last_date = last_tmst[0].date()
+    starting_date = last_date - timedelta(days=days)  # keep only last 15 days
 
-    # convert timestamps to dates
-    tstmps = liquids[0].tolist()
-    dates = [d.date() for d in tstmps]
+    # keep only 15 last days, i.e. sessions after the starting date
+    liquids = (
+        reward_animal
+        * (experiment.Session & f'session_tmst >= "{starting_date + timedelta(days=1)}"')
+    ).fetch("session_tmst", "reward_amount", order_by="session_tmst")
 
-    # find first index for plot, i.e. for last 15 days
-    last_date = dates[-1]
-    starting_date = last_date - timedelta(days=days)  # keep only last 15 days
-    starting_idx = bisect.bisect_right(dates, starting_date)
-
-    # keep only 15 last days
-    # construct the list of tuples (date,reward)
-    dates_ = dates[starting_idx:]  # lick dates, for last 15 days
-    liqs_ = liquids[1][starting_idx:].tolist()  # lick rewards for last 15 days
-    tuples_list = list(zip(dates_, liqs_))
-
-    # construct tuples (unique_date, total_reward_per_day)
-    dates_liqs_unique = [
-        (dt, sum(v for d, v in grp))
-        for dt, grp in itertools.groupby(tuples_list, key=lambda x: x[0])
-    ]
+    # rows are sorted by time, so every day is one contiguous run of rewards
+    reward_days = pd.to_datetime(liquids[0]).normalize().to_numpy()
+    day_starts = np.flatnonzero(reward_days[1:] != reward_days[:-1]) + 1
+    day_starts = np.concatenate(([0], day_starts))
+
+    # unique dates and total reward per day
+    dates_to_plot = pd.DatetimeIndex(reward_days[day_starts]).date.tolist()
+    liqs_to_plot = np.add.reduceat(liquids[1].astype(float), day_starts).tolist()
     print(
-        f"############### last date: {dates_liqs_unique[-1][0]}, amount: {dates_liqs_unique[-1][1]} ###############"
+        f"############### last date: {dates_to_plot[-1]}, amount: {liqs_to_plot[-1]} ###############"
     )
 
-    dates_to_plot = [tpls[0] for tpls in dates_liqs_unique]
-    liqs_to_plot = [tpls[1] for tpls in dates_liqs_unique]
-
     # plot
     plt.figure(figsize=(14, 4))
     plt.plot(dates_to_plot, liqs_to_plot, linestyle="--", marker="o")
@@ -1177,6 +1175,7 @@ def plot_trial_events_raster(
     xlim: Tuple[int, int] = (-100, 2000),
     figsize: Tuple[int, int] = (20, 12),
     state_color: Optional[Dict[str, str]] = None,
+    rasterized: bool = False,
 ) -> Tuple[plt.Figure, plt.Axes]:
     """Plot per-trial ON-OFF proximity, lick, and state data as a raster.
 
@@ -1220,6 +1219,10 @@ def plot_trial_events_raster(
         state_color (Optional[Dict[str, str]], optional): Mapping of state
             name to colour string. If ``None``, a default palette is used.
             Defaults to ``None``.
+        rasterized (bool, optional): Draw the event markers and spans as a
+            bitmap at figure dpi. Speeds up saving PNG files of large sessions
+            but embeds a bitmap instead of vector marks in PDF/SVG output.
+            Defaults to ``False``.
 
     Returns:
         Tuple[plt.Figure, plt.Axes]: The matplotlib figure and axes objects.
@@ -1258,63 +1261,78 @@ def plot_trial_events_raster(
     pos_map = {trl: i for i, trl in enumerate(trial_list)}
 
     fig, ax = plt.subplots(figsize=figsize)
-    seen_labels: set = set()
 
-    def _scatter(x, y, color, label, marker=".", s=20):
-        if not len(x):
-            return
-        lbl = label if label not in seen_labels else "_nolegend_"
-        seen_labels.add(label)
-        ax.scatter(x, y, s=s, alpha=0.7, color=color, marker=marker, label=lbl, zorder=3)
+    # Events are collected per legend label and drawn with one artist per
+    # label, in order of first appearance, instead of one artist per event.
+    # Spans and points share the registry so the legend keeps that order.
+    layers: Dict[str, Dict[str, Any]] = {}
+
+    def _scatter(x, y, color, label, marker=".", s=20, alpha=0.7, zorder=3):
+        layer = layers.setdefault(
+            label,
+            {"kind": "points", "x": [], "y": [], "color": color, "marker": marker,
+             "s": s, "alpha": alpha, "zorder": zorder},
+        )
+        layer["x"].extend(np.atleast_1d(x))
+        layer["y"].extend(np.atleast_1d(y))
 
     def _span(x0, x1, ypos, color, label, alpha=0.25):
-        lbl = label if label not in seen_labels else "_nolegend_"
-        seen_labels.add(label)
-        ax.fill_betweenx(
-            [ypos - 0.45, ypos + 0.45], x0, x1,
-            alpha=alpha, color=color, zorder=2, label=lbl,
+        layer = layers.setdefault(
+            label, {"kind": "span", "verts": [], "color": color, "alpha": alpha}
+        )
+        layer["verts"].append(
+            [(x0, ypos - 0.45), (x1, ypos - 0.45), (x1, ypos + 0.45), (x0, ypos + 0.45)]
         )
 
-    for _, row in df.iterrows():
-        trl = row["trial_idx"]
-        ref = row["ref_time"]
-        ypos = pos_map[trl]
+    for row in df.itertuples(index=False):
+        ref = row.ref_time
+        ypos = pos_map[row.trial_idx]
 
         on_t, off_t = [], []
-        for pair in row["all_on_off_pairs"]:
+        for pair in row.all_on_off_pairs:
             t_on = pair["time_on"] - ref
             t_off = pair["time_off"] - ref
             _span(t_on, t_off, ypos, color="grey", label="In sensor")
             on_t.append(t_on)
             off_t.append(t_off)
 
-        _scatter(np.array(on_t), np.full(len(on_t), ypos), "green", "ON")
-        _scatter(np.array(off_t), np.full(len(off_t), ypos), "red", "OFF")
+        _scatter(on_t, np.full(len(on_t), ypos), "green", "ON")
+        _scatter(off_t, np.full(len(off_t), ypos), "red", "OFF")
 
-        lick_t = np.array(row["all_lick_times"]) - ref
+        lick_t = np.asarray(row.all_lick_times, dtype=float) - ref
         _scatter(lick_t, np.full(len(lick_t), ypos), "green", "Lick", marker="x")
 
-        if row["response_lick_time"] is not None:
-            ml = row["response_lick_time"] - ref
-            lbl = "Response lick" if "Response lick" not in seen_labels else "_nolegend_"
-            seen_labels.add("Response lick")
-            ax.scatter([ml], [ypos], s=50, color="green", marker="*",
-                       label=lbl, zorder=5, alpha=0.9)
+        if row.response_lick_time is not None:
+            ml = row.response_lick_time - ref
+            _scatter(ml, ypos, "green", "Response lick", marker="*", s=50,
+                     alpha=0.9, zorder=5)
 
-        for st, st_abs in row["state_times"].items():
+        for st, st_abs in row.state_times.items():
             if st not in state_color:
                 continue
             st_t = st_abs - ref
-            lbl = st if st not in seen_labels else "_nolegend_"
-            seen_labels.add(st)
-            ax.scatter(st_t, ypos, s=7, alpha=1, color=state_color[st],
-                       marker=">", label=lbl, zorder=3)
+            _scatter(st_t, ypos, state_color[st], st, marker=">", s=7, alpha=1)
 
             if st in ("Reward", "Punish", "Abort") and off_t:
                 valid = [x for x in off_t if x <= st_t]
                 if valid:
                     _span(valid[-1], st_t, ypos, color=state_color[st], label=st + " period")
 
+    for label, layer in layers.items():
+        if layer["kind"] == "span":
+            ax.add_collection(
+                PolyCollection(
+                    layer["verts"], facecolors=layer["color"], edgecolors="none",
+                    alpha=layer["alpha"], zorder=2, label=label, rasterized=rasterized,
+                )
+            )
+        else:
+            ax.scatter(
+                layer["x"], layer["y"], s=layer["s"], alpha=layer["alpha"],
+                color=layer["color"], marker=layer["marker"], label=label,
+                zorder=layer["zorder"], rasterized=rasterized,
+            )
+
     ax.axvline(0, color="black", linewidth=1, linestyle=":", alpha=0.6, zorder=4)
 
     ax.set_yticks(range(len(trial_list)))
@@ -0,0 +1,35 @@
+"""Tests for the lazily resolved package attributes."""
+
+import importlib
+
+import pytest
+
+
+def test_dir_lists_subpackages():
+    import ethopy_analysis
+
+    assert "config" in dir(ethopy_analysis)
+    assert "data" in dir(ethopy_analysis)
+
+
+def test_config_subpackage_resolves():
+    import ethopy_analysis
+
+    assert ethopy_analysis.config is importlib.import_module("ethopy_analysis.config")
+
+
+def test_data_configure_cache_resolves():
+    pytest.importorskip("datajoint")
+    pytest.importorskip("pandas")
+    import ethopy_analysis
+
+    from ethopy_analysis.data.cache import configure_cache
+
+    assert ethopy_analysis.data.configure_cache is configure_cache
+
+
+def test_unknown_attribute_raises():
+    import ethopy_analysis
+
+    with pytest.raises(AttributeError):
+        ethopy_analysis.not_a_module